@@ -6,6 +6,7 @@ export default function History() {
   const router = useRouter();
   const [isLoading, setIsLoading] = useState(false);
   const [patientData, setPatientData] = useState({
+    patient_id: "",
     age: "",
     sex: "",
     disease: "",
@@ -58,6 +59,7 @@ export default function History() {
       <p className="text-lg text-gray-300 mb-8">Fill in your medical information and medications.</p>
 
       <div className="flex flex-col space-y-6 w-full max-w-lg">
+        <input type="text" name="patient_id" placeholder="Patient ID (optional, reuses earlier results)" value={patientData.patient_id} onChange={handleChange} className="w-full p-3 rounded bg-gray-800 border border-gray-500 text-white"/>
         <input type="number" name="age" placeholder="Age" value={patientData.age} onChange={handleChange} className="w-full p-3 rounded bg-gray-800 border border-gray-500 text-white"/>
         <select name="sex" value={patientData.sex} onChange={handleChange} className="w-full p-3 rounded bg-gray-800 border border-gray-500 text-white">
           <option value="">Select Sex</option>
@@ -2,6 +2,15 @@ from fastapi import FastAPI
 from src.drug_interaction import analyze_drug_interactions
 from src.db_utils import search_drugs
 from src.final_report import generate_final_report
+from src.patient_history import (
+    get_pair_results,
+    save_pair_result,
+    find_pairs_to_analyze,
+    get_final_report,
+    save_final_report,
+    is_report_current,
+    pair_key,
+)
 from fastapi.middleware.cors import CORSMiddleware
 import time
 
@@ -41,19 +50,50 @@ async def analyze_interaction(patient_data: dict):
         drug_combinations.append([test_drug, med])
     
 
+    # Without a patient ID every pair is analyzed from scratch
+    patient_id = patient_data.get("patient_id")
+    if patient_id is not None:
+        patient_id = str(patient_id)
+    pair_results = get_pair_results(patient_id) if patient_id else {}
+    pairs_to_analyze = find_pairs_to_analyze(drug_combinations, pair_results)
+
+    if patient_id and not pairs_to_analyze:
+        cached_report = get_final_report(patient_id)
+        if is_report_current(cached_report, drug_combinations):
+            return cached_report["final_report"]
+
     db_results = []
     reports = []
+    # Pairs whose database lookup or web search failed are not cached, and
+    # neither is a final report built from them
+    lookup_failed = False
 
     for combination in drug_combinations:
         drug1 = combination[0]
         drug2 = combination[1]
+        if pair_key(drug1, drug2) not in pairs_to_analyze:
+            cached = pair_results[pair_key(drug1, drug2)]
+            db_results.append(cached["db_results"])
+            reports.append(cached["report"])
+            continue
         time.sleep(1)
         results = search_drugs(drug1, drug2)
+        report = analyze_drug_interactions(drug1, drug2)
+        pair_failed = results is None or report is None
+        lookup_failed = lookup_failed or pair_failed
+        # Rows as lists, the same shape cached results come back from JSONB in
+        results = [list(row) for row in results or []]
+        if report is None:
+            report = f"No information could be retrieved about interactions between {drug1} and {drug2}."
         db_results.append(results)
-        reports.append(analyze_drug_interactions(drug1, drug2))
+        reports.append(report)
+        if patient_id and not pair_failed:
+            save_pair_result(patient_id, drug1, drug2, results, report)
 
     
     final_report = generate_final_report(db_results, '\n'.join(reports))
+    if patient_id and not lookup_failed:
+        save_final_report(patient_id, drug_combinations, final_report)
     
 
 
@@ -1,11 +1,8 @@
 import psycopg2
 import csv
 
-DB_NAME = "drug_interaction_database"
-DB_USER = "myuser"
-DB_PASSWORD = "password"
-DB_HOST = "localhost"
-DB_PORT = "5432"
+# Run as a script from src/, so the shared settings are imported by module name
+from db_config import DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT
 
 conn = psycopg2.connect(
     dbname="postgres", user=DB_USER, password=DB_PASSWORD, host=DB_HOST, port=DB_PORT
@@ -51,6 +48,58 @@ with open(csv_file, "r", newline='', encoding="utf-8") as f:
     cursor.copy_from(f, 'drug_side_effect_table', sep=',', columns=('num_row','stitch_id_1', 'stitch_id_2', 'side_effect_id', 'side_effect_name', 'drug_name_1', 'drug_name_2'))
 
 
+## local store of scraped pages, kept across runs
+cursor.execute("""
+    CREATE TABLE IF NOT EXISTS scraped_document_table (
+        url TEXT PRIMARY KEY,
+        title TEXT,
+        scraped_text TEXT,
+        drug_names TEXT[],
+        scraped_at TIMESTAMPTZ DEFAULT NOW()
+    );
+""")
+
+# tables created before scraped_at was timezone-aware
+cursor.execute("ALTER TABLE scraped_document_table ALTER COLUMN scraped_at TYPE TIMESTAMPTZ;")
+
+cursor.execute("""
+    CREATE TABLE IF NOT EXISTS document_chunk_table (
+        id SERIAL PRIMARY KEY,
+        url TEXT REFERENCES scraped_document_table(url) ON DELETE CASCADE,
+        chunk_index INTEGER,
+        drug_names TEXT[],
+        content TEXT,
+        content_tsv TSVECTOR GENERATED ALWAYS AS (to_tsvector('english', content)) STORED
+    );
+""")
+
+cursor.execute("CREATE INDEX IF NOT EXISTS document_chunk_tsv_idx ON document_chunk_table USING GIN (content_tsv);")
+cursor.execute("CREATE INDEX IF NOT EXISTS document_chunk_drugs_idx ON document_chunk_table USING GIN (drug_names);")
+
+
+## per-patient analysis history
+cursor.execute("""
+    CREATE TABLE IF NOT EXISTS patient_pair_result_table (
+        patient_id VARCHAR(100),
+        drug_name_1 VARCHAR(100),
+        drug_name_2 VARCHAR(100),
+        db_results JSONB,
+        report TEXT,
+        analyzed_at TIMESTAMPTZ DEFAULT NOW(),
+        PRIMARY KEY (patient_id, drug_name_1, drug_name_2)
+    );
+""")
+
+cursor.execute("""
+    CREATE TABLE IF NOT EXISTS patient_report_table (
+        patient_id VARCHAR(100) PRIMARY KEY,
+        drug_pairs JSONB,
+        final_report JSONB,
+        updated_at TIMESTAMPTZ DEFAULT NOW()
+    );
+""")
+
+
 conn.commit()
 cursor.close()
 conn.close()
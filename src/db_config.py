@@ -0,0 +1,13 @@
+import psycopg2
+
+DB_NAME = "drug_interaction_database"
+DB_USER = "myuser"
+DB_PASSWORD = "password"
+DB_HOST = "localhost"
+DB_PORT = "5432"
+
+
+def get_connection():
+    return psycopg2.connect(
+        dbname=DB_NAME, user=DB_USER, password=DB_PASSWORD, host=DB_HOST, port=DB_PORT
+    )
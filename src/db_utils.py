@@ -1,17 +1,12 @@
-import psycopg2
+from src.db_config import get_connection
 
 def search_drugs(drug_name_1, drug_name_2):
     results_list = []  # Initialize an empty list to store the results
+    conn = None
 
     try:
         # Connect to the PostgreSQL database
-        conn = psycopg2.connect(
-            dbname = "drug_interaction_database",
-            user = "myuser",
-            password = "password",
-            host = "localhost",
-            port = "5432"
-        )
+        conn = get_connection()
         cursor = conn.cursor()
 
         # Case-insensitive search using ILIKE
@@ -35,12 +30,13 @@ def search_drugs(drug_name_1, drug_name_2):
 
     except Exception as e:
         print(f"Error: {e}")
+        results_list = None  # Tell the caller the lookup failed, not that nothing matched
     finally:
         # Close the database connection
-        cursor.close()
-        conn.close()
+        if conn is not None:
+            conn.close()
 
-    return results_list  # Return the results as a list of lists
+    return results_list  # Return the results as a list of lists, or None on failure
 
 
 # if __name__ == "__main__":
@@ -0,0 +1,169 @@
+import re
+from datetime import timedelta
+from src.db_config import get_connection
+
+# Paragraphs shorter than this (stray headings, cookie banners, ...) are folded
+# into the following paragraph instead of becoming chunks of their own
+MIN_CHUNK_LENGTH = 80
+
+# Local evidence is only used when it comes from enough distinct pages
+MIN_LOCAL_SOURCES = 2
+
+# Stored pages older than this are fetched again and left out of local search
+DOCUMENT_MAX_AGE = timedelta(days=30)
+
+INTERACTION_TERMS = "interaction | interact | side & effect | adverse | contraindicated | risk"
+
+
+def chunk_text(scraped_text):
+    # scrape_text_from_url joins paragraphs and headings with blank lines
+    chunks = []
+    pending = ""
+    for paragraph in scraped_text.split("\n\n"):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        pending = f"{pending}\n{paragraph}" if pending else paragraph
+        if len(pending) >= MIN_CHUNK_LENGTH:
+            chunks.append(pending)
+            pending = ""
+    if pending:
+        chunks.append(pending)
+    return chunks
+
+
+def normalize_drug_names(drug_names):
+    return sorted({drug.strip().lower() for drug in drug_names if drug and drug.strip()})
+
+
+def tag_chunk(chunk, drug_names):
+    # Whole-word matches only, so "heparinoid" is not tagged as heparin
+    lowered = chunk.lower()
+    return [drug for drug in drug_names if re.search(rf"\b{re.escape(drug)}\b", lowered)]
+
+
+def get_document(url):
+    document = None
+    conn = None
+
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT url, title, scraped_text
+            FROM scraped_document_table
+            WHERE url = %s AND NOW() - scraped_at <= %s
+        """, (url, DOCUMENT_MAX_AGE))
+        row = cursor.fetchone()
+        if row:
+            document = {"url": row[0], "title": row[1], "scraped_text": row[2]}
+        cursor.close()
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        if conn is not None:
+            conn.close()
+
+    return document
+
+
+def store_document(url, title, scraped_text, drug_names, fetched=True):
+    drug_names = normalize_drug_names(drug_names)
+    conn = None
+
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        # A page stored again for another pair keeps its old tags as well. Only
+        # an actual fetch renews scraped_at, re-tagging does not
+        cursor.execute("SELECT drug_names FROM scraped_document_table WHERE url = %s", (url,))
+        row = cursor.fetchone()
+        if row and row[0]:
+            drug_names = normalize_drug_names(drug_names + row[0])
+
+        cursor.execute("""
+            INSERT INTO scraped_document_table (url, title, scraped_text, drug_names)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (url) DO UPDATE
+            SET title = EXCLUDED.title, scraped_text = EXCLUDED.scraped_text,
+                drug_names = EXCLUDED.drug_names,
+                scraped_at = CASE WHEN %s THEN NOW() ELSE scraped_document_table.scraped_at END
+        """, (url, title, scraped_text, drug_names, fetched))
+
+        cursor.execute("DELETE FROM document_chunk_table WHERE url = %s", (url,))
+        for index, chunk in enumerate(chunk_text(scraped_text)):
+            cursor.execute("""
+                INSERT INTO document_chunk_table (url, chunk_index, drug_names, content)
+                VALUES (%s, %s, %s, %s)
+            """, (url, index, tag_chunk(chunk, drug_names), chunk))
+
+        conn.commit()
+        cursor.close()
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+def search_documents(drug1, drug2, limit=10):
+    results_list = []
+    drug_names = normalize_drug_names([drug1, drug2])
+    conn = None
+
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        # Chunks from fresh pages must concern one of the drugs, either through
+        # their tags or their text. Chunks whose text mentions both drugs come
+        # first, since tags only reflect the pair a page was fetched for, then
+        # chunks are ranked by how well they cover the drugs and interaction
+        # vocabulary
+        query = """
+            WITH q AS (
+                SELECT
+                    plainto_tsquery('english', %s) AS drug1,
+                    plainto_tsquery('english', %s) AS drug2,
+                    to_tsquery('english', %s) AS terms
+            )
+            SELECT c.url, d.title, c.content, c.drug_names,
+                   ts_rank_cd(c.content_tsv, q.drug1 || q.drug2 || q.terms) AS rank
+            FROM document_chunk_table c
+            JOIN scraped_document_table d ON d.url = c.url, q
+            WHERE NOW() - d.scraped_at <= %s
+              AND (c.drug_names && %s::TEXT[] OR c.content_tsv @@ (q.drug1 || q.drug2))
+            ORDER BY c.content_tsv @@ (q.drug1 && q.drug2) DESC,
+                     cardinality(ARRAY(SELECT unnest(c.drug_names) INTERSECT SELECT unnest(%s::TEXT[]))) DESC,
+                     rank DESC
+            LIMIT %s
+        """
+        cursor.execute(query, (drug1, drug2, INTERACTION_TERMS, DOCUMENT_MAX_AGE, drug_names, drug_names, limit))
+
+        results_list = [
+            {"url": row[0], "title": row[1], "text": row[2], "drug_names": row[3], "rank": row[4]}
+            for row in cursor.fetchall()
+        ]
+        cursor.close()
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        if conn is not None:
+            conn.close()
+
+    return results_list
+
+
+def has_sufficient_recall(chunks, drug1, drug2):
+    # At least one chunk has to discuss both drugs together, and the evidence
+    # has to come from more than a single page
+    if len({chunk["url"] for chunk in chunks}) < MIN_LOCAL_SOURCES:
+        return False
+    drug_names = normalize_drug_names([drug1, drug2])
+    for chunk in chunks:
+        covered = set(chunk["drug_names"] or []) | set(tag_chunk(chunk["text"], drug_names))
+        if all(drug in covered for drug in drug_names):
+            return True
+    return False
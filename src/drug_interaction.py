@@ -1,6 +1,7 @@
 import os
 from src.web_search import brave_search
 from src.scraper import scrape_text_from_url
+from src.document_store import get_document, store_document, search_documents, has_sufficient_recall
 from src.openai_api import OpenAIAPI
 import time
 
@@ -8,18 +9,56 @@ import time
 openai_api = OpenAIAPI()
 
 
-def analyze_drug_interactions(drug1, drug2):
+def retrieve_local_evidence(drug1, drug2):
+    chunks = search_documents(drug1, drug2)
+    if not has_sufficient_recall(chunks, drug1, drug2):
+        return None
 
-    search_query = f"{drug1} {drug2} interaction side effects medical"
+    search_text_results = {}
+    for chunk in chunks:
+        url = chunk["url"]
+        if url not in search_text_results:
+            search_text_results[url] = {"text": chunk["text"], "title": chunk["title"]}
+        else:
+            search_text_results[url]["text"] += "\n\n" + chunk["text"]
+    return search_text_results
+
+
+def retrieve_web_evidence(search_query, drug1, drug2):
     search_results = brave_search(search_query, 3)
+    if search_results is None:
+        return None
     search_text_results = {}
     for result in search_results:
         url = result["url"]
-        time.sleep(1)
-        text = scrape_text_from_url(url)
+        # Pages already scraped for another pair are served from the local store
+        text = get_document(url)
+        fetched = text is None
+        if fetched:
+            time.sleep(1)
+            text = scrape_text_from_url(url)
         if text is not None:
+            # Re-storing a known page adds this pair's drugs to its tags
+            store_document(url, result["title"], text["scraped_text"], [drug1, drug2], fetched)
             text = text["scraped_text"]
             search_text_results[url] = {"text": text, "title": result["title"]}
+    return search_text_results
+
+
+def analyze_drug_interactions(drug1, drug2):
+
+    search_query = f"{drug1} {drug2} interaction side effects medical"
+    search_text_results = retrieve_local_evidence(drug1, drug2)
+    if search_text_results is not None:
+        evidence_source = "- Evidence source: pages scraped earlier for other drug pairs, retrieved from the local document store"
+        evidence_heading = "Here are the relevant passages from previously scraped pages:"
+    else:
+        search_text_results = retrieve_web_evidence(search_query, drug1, drug2)
+        if search_text_results is None:
+            # No evidence could be gathered, so there is nothing to analyze
+            return None
+        evidence_source = f'- Search query: "{search_query}"'
+        evidence_heading = "Here are the search results I found:"
 
     sources_text = "\n\n".join([f"## {result['title']}\n{result['text']}" for result in search_text_results.values()])
     
@@ -29,12 +68,12 @@ def analyze_drug_interactions(drug1, drug2):
     
     Search information: 
     - Drugs being analyzed: {drug1} and {drug2}
-    - Search query: "{search_query}"
+    {evidence_source}
     
-    Here are the search results I found:
+    {evidence_heading}
     {sources_text}
     
-    Based on these search results and your medical knowledge, please:
+    Based on these sources and your medical knowledge, please:
     1. Identify if there are any known interactions between these two medications
     2. List the potential side effects that could occur when taking these medications together
     3. Rate the severity of the interaction (Minor, Moderate, Major)
@@ -43,7 +82,7 @@ def analyze_drug_interactions(drug1, drug2):
     Present your findings in a structured format with headings. Cite the sources from the search results to support your claims.
     Include a disclaimer about consulting healthcare professionals.
     
-    If there isn't enough information in the search results, acknowledge the limitations and provide general information about drug interactions while emphasizing the importance of consulting a healthcare provider.
+    If there isn't enough information in these sources, acknowledge the limitations and provide general information about drug interactions while emphasizing the importance of consulting a healthcare provider.
     """
     
     response = openai_api.generate(prompt)
@@ -0,0 +1,132 @@
+from psycopg2.extras import Json
+from datetime import timedelta
+from src.db_config import get_connection
+
+# Cached pair results older than this are analyzed again
+PAIR_RESULT_MAX_AGE = timedelta(days=30)
+
+
+def pair_key(drug1, drug2):
+    return (drug1.strip().lower(), drug2.strip().lower())
+
+
+def get_pair_results(patient_id):
+    pair_results = {}
+    conn = None
+
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        # Age is computed by the database so it is not affected by the
+        # app host's clock or timezone
+        cursor.execute("""
+            SELECT drug_name_1, drug_name_2, db_results, report, NOW() - analyzed_at > %s
+            FROM patient_pair_result_table
+            WHERE patient_id = %s
+        """, (PAIR_RESULT_MAX_AGE, patient_id))
+
+        for row in cursor.fetchall():
+            pair_results[(row[0], row[1])] = {
+                "db_results": row[2],
+                "report": row[3],
+                "stale": row[4],
+            }
+        cursor.close()
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        if conn is not None:
+            conn.close()
+
+    return pair_results
+
+
+def save_pair_result(patient_id, drug1, drug2, db_results, report):
+    conn = None
+
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            INSERT INTO patient_pair_result_table (patient_id, drug_name_1, drug_name_2, db_results, report)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (patient_id, drug_name_1, drug_name_2) DO UPDATE
+            SET db_results = EXCLUDED.db_results, report = EXCLUDED.report, analyzed_at = NOW()
+        """, (patient_id, *pair_key(drug1, drug2), Json(db_results), report))
+
+        conn.commit()
+        cursor.close()
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+def find_pairs_to_analyze(drug_combinations, pair_results):
+    # A pair needs analysis when it was never analyzed for this patient or its
+    # cached result has gone stale
+    pairs_to_analyze = []
+    for drug1, drug2 in drug_combinations:
+        cached = pair_results.get(pair_key(drug1, drug2))
+        if cached is None or cached["stale"]:
+            pairs_to_analyze.append(pair_key(drug1, drug2))
+    return pairs_to_analyze
+
+
+def get_final_report(patient_id):
+    final_report = None
+    conn = None
+
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(
+            "SELECT drug_pairs, final_report FROM patient_report_table WHERE patient_id = %s",
+            (patient_id,),
+        )
+        row = cursor.fetchone()
+        if row:
+            final_report = {"drug_pairs": row[0], "final_report": row[1]}
+        cursor.close()
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        if conn is not None:
+            conn.close()
+
+    return final_report
+
+
+def save_final_report(patient_id, drug_combinations, final_report):
+    conn = None
+
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        drug_pairs = sorted(list(pair_key(drug1, drug2)) for drug1, drug2 in drug_combinations)
+        cursor.execute("""
+            INSERT INTO patient_report_table (patient_id, drug_pairs, final_report)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (patient_id) DO UPDATE
+            SET drug_pairs = EXCLUDED.drug_pairs, final_report = EXCLUDED.final_report, updated_at = NOW()
+        """, (patient_id, Json(drug_pairs), Json(final_report)))
+
+        conn.commit()
+        cursor.close()
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+def is_report_current(cached_report, drug_combinations):
+    if cached_report is None or cached_report["final_report"] is None:
+        return False
+    drug_pairs = sorted(list(pair_key(drug1, drug2)) for drug1, drug2 in drug_combinations)
+    return cached_report["drug_pairs"] == drug_pairs
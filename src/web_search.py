@@ -5,10 +5,8 @@ import os
 def parse_brave_search_results(search_results):
     if search_results is None:
         return None
-    results = search_results.get("web", {}).get("results", [])
-    if len(results) == 0:
-        return None
-    return results
+    # An empty list means no results; None is kept for failed requests
+    return search_results.get("web", {}).get("results", [])
 
 def brave_search(query, count=10):
     base_url = "https://api.search.brave.com/res/v1/web/search"